@@ -0,0 +1,37 @@
+# cython: language_level=3
+"""
+Compiled dedup kernel for `generator.merge_ui_jsons`.
+
+Build it once with `cythonize -i _merge.pyx` (needs a C compiler and Cython,
+from requirements-dev.txt).
+generator.py imports the prebuilt extension when present and otherwise falls
+back to its pure Python `_dedup`.
+"""
+import json
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+cdef bytes _canonical_key(object d):
+    if orjson is not None:
+        return orjson.dumps(d, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(d, sort_keys=True).encode('utf-8')
+
+
+def dedup_dicts(object existing, object new):
+    """Union of two lists of dicts, keyed by their canonical JSON form."""
+    cdef dict seen = {}
+    cdef bytes key
+    cdef object d
+    for d in existing:
+        key = _canonical_key(d)
+        if key not in seen:
+            seen[key] = d
+    for d in new:
+        key = _canonical_key(d)
+        if key not in seen:
+            seen[key] = d
+    return list(seen.values())
@@ -0,0 +1,52 @@
+"""
+Build step: renders the static part of the master prompt (role, examples and
+instructions) into `_compiled_prefix.py`, so generator.py can import it instead
+of reading the example files and formatting the template on every run.
+
+Run it from the project root, and again after changing an example file; a
+stale compiled prefix is ignored by generator.py.
+
+    python compile_prefix.py [--prefix src/test/java/com/sdp/m1]
+"""
+import argparse
+import os
+
+from generator import example_mtimes, load_examples, prompt_template_hash, PROMPT_PREFIX
+
+OUTPUT_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "_compiled_prefix.py")
+
+
+def compile_prefix(prefix="src/test/java/com/sdp/m1", output_path=OUTPUT_PATH):
+    """
+    Writes the rendered prompt prefix as a Python module, along with what it
+    was built from so generator.py can tell when it is out of date.
+    """
+    # Taken before reading, so an example edited meanwhile marks the build stale
+    mtimes = example_mtimes(prefix)
+    prompt_prefix = PROMPT_PREFIX.render(**load_examples(prefix))
+
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write("# Generated by compile_prefix.py; do not edit.\n")
+        f.write(f"EXAMPLES_PREFIX = {prefix!r}\n")
+        f.write(f"TEMPLATE_SHA1 = {prompt_template_hash()!r}\n")
+        f.write(f"EXAMPLE_MTIMES = {mtimes!r}\n")
+        f.write(f"PREFIX = {prompt_prefix!r}\n")
+    os.replace(tmp_path, output_path)
+    print(f"Compiled prompt prefix ({len(prompt_prefix)} chars) to {output_path}")
+    return output_path
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Precompile the master prompt prefix from the example files."
+    )
+    parser.add_argument(
+        "--prefix", type=str, default="src/test/java/com/sdp/m1", help="Prefix of the example files, as for generator.py."
+    )
+    args = parser.parse_args()
+    compile_prefix(args.prefix)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,40 @@
 import argparse
+import asyncio
+import contextlib
+import glob
+import hashlib
+import importlib.util
+import io
 import json
+import multiprocessing
 import os
-import pdfplumber
-from openai import OpenAI, api_key
+import re
+import string
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from dotenv import load_dotenv
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the standard library encoder
+    orjson = None
+# pdfplumber/PyMuPDF and openai/httpx are imported where they are used, so
+# commands that only build prompts don't pay for loading them.
+# Optional: fall back to pdfplumber for text extraction
+HAS_PYMUPDF = importlib.util.find_spec("pymupdf") is not None
+try:
+    import ijson
+except ImportError:  # Optional: fall back to loading UI JSON files whole
+    ijson = None
+try:
+    import _compiled_prefix
+except ImportError:  # Optional: built by compile_prefix.py
+    _compiled_prefix = None
 # The Refactored Master Prompt, which now includes placeholders for code examples.
-MASTER_PROMPT_TEMPLATE = """ROLE: You are an expert QA Automation Engineer. Your expertise is in creating robust, maintainable, and comprehensive test suites using Java 21, Selenium 4, Cucumber 7, and Maven. You adhere strictly to the Page Object Model and BDD best practices.
+# It is split into a static prefix (role, examples, instructions) and a per-feature
+# context tail, so the prefix is byte-identical across calls and can be served from
+# the provider's prompt cache.
+MASTER_PROMPT_PREFIX_TEMPLATE = """ROLE: You are an expert QA Automation Engineer. Your expertise is in creating robust, maintainable, and comprehensive test suites using Java 21, Selenium 4, Cucumber 7, and Maven. You adhere strictly to the Page Object Model and BDD best practices.
 
 ---
 CODE STYLE AND STRUCTURE EXAMPLES:
@@ -84,7 +113,9 @@ INSTRUCTIONS:
 *   Step definition methods **must not** contain any `driver.findElement` or Selenium calls. They should only call methods on the Page Object instance.
 *   Use JUnit 5 `Assertions.assertEquals` for assertions.
 
----
+"""
+
+MASTER_PROMPT_CONTEXT_TEMPLATE = """---
 HERE IS THE CONTEXT FOR THE NEW FEATURE:
 
 **SRS JSON:**
@@ -96,15 +127,11 @@ HERE IS THE CONTEXT FOR THE NEW FEATURE:
 ```json
 {ui_json}
 ```
----
-YOUR OUTPUT:
-Provide three split, complete, and immediately usable code blocks for the following files:
-1. A new `.feature` file.
-2. A new Java Page Object class.
-3. A new Java Step Definitions class.
 """
 
-MASTER_PARSER_PROMPT = """ROLE: You are an Quality Assurance Engineer and a System Requirement Analysis that parse SRS Document into JSON. Produce STRICT, VALID JSON only.
+MASTER_PROMPT_TEMPLATE = MASTER_PROMPT_PREFIX_TEMPLATE + MASTER_PROMPT_CONTEXT_TEMPLATE
+
+MASTER_PARSER_PROMPT = """ROLE: You are an Quality Assurance Engineer and a System Requirement Analysis that parse SRS Document into JSON.
 
 Goal:
 - Convert an SRS excerpt into a hierarchical JSON schema with Sections → Sub_Sections (nested).
@@ -115,103 +142,578 @@ Goal:
 Rules:
 - Preserve all section numbers exactly (e.g., "2.1.1").
 - Each requirement must have REQ_ID and Description.
-- Extract tables of fields into "Fields" with Constraints and Validation_Rules (mandatory, lengths, patterns, ranges, allowed values, and error responses).
+- Extract tables of fields into "Fields": "Constraints" is an object (e.g. Mandatory, MaxLength, Min, Max, AllowedValues), "Validation_Rules" and "Error_Responses" are arrays of strings.
+- Other tables (e.g. appendix parameter or role lists) go into an "Entries" array of objects keyed by the table's column names.
 - If the SRS references related subsections, fill "Related_Sub_Sections" with their IDs.
 - If UI identifiers (id/xpath/name/aria-label) are present in the text, place them under "UI_Elements".
 - If procedural steps exist (like “navigate → fill → submit → verify”), create a "Flows" array describing them at the leaf node.
 - Keep arrays even if empty.
 - Do not invent data; if missing, leave nulls or empty arrays.
-
-Input:
-{context}
+- Return a single JSON object whose "Sections" key holds the array of sections.
 
 Example Output:
-[
-  {{
+{"Sections": [
+  {
         "Section_ID": "2",
     "Section_Name": "Provisioning Module",
     "Sub_Sections": [
-      {{
+      {
             "Sub_Section_ID": "2.1",
             "Sub_Section_Name": "Service Provider Profile Management",
             "Requirements": [
-                {{
+                {
                     "REQ_ID": "REQ-SP-PRO-1",
                     "Description": "SP SLA is an agreement between SDP and service provider which should be enforced before the application SLA during provisioning."
-                }},
-                {{
+                },
+                {
                     "REQ_ID": "REQ-SP-PRO-4",
                     "Description": "The SP provisioning UI shall allow users to perform actions based on access rights.",
                     "Actions": ["Register new SP", "View/Edit SP profile", "Search SPs"],
                     "Related_Sub_Sections": [
-                        {{
+                        {
                             "Sub_Section_ID": "2.1.1",
                             "Sub_Section_Name": "Register New Service Provider"
-                        }},
-                        {{
+                        },
+                        {
                             "Sub_Section_ID": "2.1.1.1",
                             "Sub_Section_Name": "Configuration of SLA for SMS"
-                        }}
+                        }
                     ]
-                }}
+                }
             ],
             "Fields": [
-                {{
+                {
                     "Field_Name": "SP Name",
                     "Type": "Text",
-                    "Validation": "Mandatory, max 50 characters",
-                    "Error_Response": "Service Provider Name is required"
-                }},
-                {{
+                    "Constraints": {"Mandatory": true, "MaxLength": 50},
+                    "Validation_Rules": ["Mandatory", "Maximum 50 characters"],
+                    "Error_Responses": ["Service Provider Name is required"]
+                },
+                {
                     "Field_Name": "SP ID",
                     "Type": "Alphanumeric",
-                    "Validation": "13 characters required",
-                    "Error_Response": "Invalid Service Provider ID"
-                }}
+                    "Constraints": {"Mandatory": true, "MinLength": 13, "MaxLength": 13},
+                    "Validation_Rules": ["Exactly 13 alphanumeric characters"],
+                    "Error_Responses": ["Invalid Service Provider ID"]
+                }
             ]
-        }}
+        }
     ]
-  }}
-]
-
-Output:
-[JSON Format]
+  }
+]}
+"""
 
+# SRS parsing is mechanical structured extraction, so it runs on a cheaper model
+# in JSON mode; test generation keeps the stronger model.
+GENERATION_MODEL = "gpt-5-mini"
+PARSER_MODEL = "gpt-5-nano"
+
+# Upper bound on generated tokens for test generation, reasoning tokens included.
+# It must fit the feature file, page object and steps class in full, so it only
+# guards against runaway output. SRS parsing is left uncapped: its output grows
+# with the document, and a cut-off JSON document is useless.
+GENERATION_MAX_COMPLETION_TOKENS = 32000
+
+# Maximum number of concurrent model requests
+MODEL_CONCURRENCY = 8
+
+# On-disk cache of model responses; disabled with --no-cache
+PROMPT_CACHE_DIR = ".prompt_cache"
+USE_PROMPT_CACHE = True
+
+# Opt-in semantic cache (--semantic-cache): a miss on the exact cache is served
+# from a previous response whose prompt embedding is nearly identical and whose
+# REQ_IDs and request options match exactly.
+USE_SEMANTIC_CACHE = False
+SEMANTIC_CACHE_THRESHOLD = 0.97
+SEMANTIC_INDEX_PATH = os.path.join(PROMPT_CACHE_DIR, "semantic_index.jsonl")
+EMBEDDING_MODEL = "text-embedding-3-small"
+# Compact JSON runs close to 2-3 characters per token; this stays under the
+# embedding model's 8k-token input limit.
+EMBEDDING_MAX_CHARS = 16000
+REQ_ID_RE = re.compile(r"\bREQ-[A-Z0-9]+(?:-[A-Z0-9]+)*")
+_SEMANTIC_INDEX = None
+
+# Numbered SRS headings such as "2.1" or "2.1.3 Search Service Provider"
+SECTION_HEADING_RE = re.compile(r"^\d+(\.\d+)+\s", re.MULTILINE)
+
+PARSER_OPTIONS = {
+    "model_name": PARSER_MODEL,
+    "max_completion_tokens": None,  # uncapped, see GENERATION_MAX_COMPLETION_TOKENS
+    # Plain JSON mode rather than a strict schema: Constraints, Entries and
+    # Notifications are open-ended objects whose keys depend on the SRS, which
+    # strict structured outputs cannot express.
+    "response_format": {"type": "json_object"},
+}
+
+# The SRS text goes in its own user message after the static parser instructions.
+PARSER_INPUT_TEMPLATE = """Input:
+{context}
 """
 
+
+class _CompiledTemplate:
+    """
+    A `str.format` template parsed once into pre-indexed segments, so the
+    placeholders are filled with a single join (or streamed straight to a
+    file) instead of re-parsing the template on every call. Values must be
+    strings.
+    """
+
+    def __init__(self, template):
+        self.parts = []
+        self.slots = []
+        for literal, field, _, _ in string.Formatter().parse(template):
+            if literal:
+                self.parts.append(literal)
+            if field is not None:
+                self.slots.append((len(self.parts), field))
+                self.parts.append(None)
+
+    def _fill(self, kwargs):
+        parts = self.parts.copy()
+        for index, field in self.slots:
+            parts[index] = kwargs[field]
+        return parts
+
+    def render(self, **kwargs):
+        return "".join(self._fill(kwargs))
+
+    def emit(self, out, **kwargs):
+        """Writes the filled template to `out` piece by piece."""
+        for part in self._fill(kwargs):
+            out.write(part)
+
+
+PROMPT_PREFIX = _CompiledTemplate(MASTER_PROMPT_PREFIX_TEMPLATE)
+PROMPT_CONTEXT = _CompiledTemplate(MASTER_PROMPT_CONTEXT_TEMPLATE)
+PARSER_INPUT = _CompiledTemplate(PARSER_INPUT_TEMPLATE)
+
+
+def _json_loads(data):
+    """Parses JSON from str or bytes, using orjson when available."""
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumpb(obj, indent=False, sort_keys=False):
+    """Serializes to UTF-8 JSON bytes, using orjson when available (indent is 2 spaces)."""
+    if orjson is not None:
+        option = 0
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        return orjson.dumps(obj, option=option)
+    return _json_dumps(obj, indent, sort_keys).encode('utf-8')
+
+
+def _json_dumps(obj, indent=False, sort_keys=False):
+    """
+    Serializes to a JSON str, using orjson when available. Output is either
+    indented by 2 spaces or fully compact (no spaces after separators).
+    """
+    if orjson is not None:
+        return _json_dumpb(obj, indent, sort_keys).decode('utf-8')
+    if indent:
+        return json.dumps(obj, indent=2, sort_keys=sort_keys, ensure_ascii=False)
+    return json.dumps(obj, separators=(',', ':'), sort_keys=sort_keys, ensure_ascii=False)
+
 # Debugging
 
 
 def run_unit_test(ui_json_paths):
-    parsed_ui_jsons = []
-    for ui_path in ui_json_paths:
-        with open(ui_path, 'r', encoding='utf-8') as f:
-            parsed_ui_jsons.append(json.load(f))
-
-    merged_ui_data = merge_ui_jsons(parsed_ui_jsons)
+    merged_ui_data = merge_ui_files(ui_json_paths)
     # Debugging
-    with open("merged_page_data.json", 'w', encoding='utf-8') as f:
+    with open("merged_page_data.json", 'wb') as f:
         try:
-            json.dump(merged_ui_data, f, indent=4)
+            f.write(_json_dumpb(merged_ui_data, indent=True))
         except Exception as e:
             print(f"Error writing to file: {e}")
 
 
-def run_model(prompt):
+# OpenAI clients: `model` is created by main() for commands that call the
+# model, `async_model` only for the duration of an `async_model_session`.
+model = None
+async_model = None
+
+
+def _http_client_options():
     """
-    Runs the AI model with the given prompt and returns the response.
+    Pooled HTTP client settings, with HTTP/2 enabled when the `h2` package is
+    installed, so concurrent requests reuse connections instead of paying a
+    TLS handshake per call.
+    """
+    import httpx
+
+    return dict(
+        http2=importlib.util.find_spec("h2") is not None,
+        limits=httpx.Limits(max_connections=32, max_keepalive_connections=32),
+    )
+
+
+def create_model_client(api_key):
+    """Creates the sync OpenAI client, shared by every synchronous call."""
+    from openai import DefaultHttpxClient, OpenAI
+
+    return OpenAI(api_key=api_key, http_client=DefaultHttpxClient(**_http_client_options()))
+
+
+@contextlib.asynccontextmanager
+async def async_model_session():
+    """
+    Binds `async_model` to an AsyncOpenAI client for the running event loop and
+    closes it on exit. Pooled connections belong to the loop that opened them,
+    so every `asyncio.run` needs its own client rather than a shared one.
+    """
+    from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+
+    global async_model
+    async_model = AsyncOpenAI(
+        api_key=model.api_key, http_client=DefaultAsyncHttpxClient(**_http_client_options()))
+    try:
+        yield async_model
+    finally:
+        await async_model.close()
+        async_model = None
+
+
+def _model_request(prompt, system_prompt=None, model_name=GENERATION_MODEL, response_format=None,
+                   max_completion_tokens=GENERATION_MAX_COMPLETION_TOKENS):
+    """
+    Builds the chat completion arguments shared by `run_model` and `arun_model`.
+
+    A static `system_prompt` is sent as its own leading message, keyed by its
+    hash, so repeated calls sharing it hit the provider's prompt prefix cache.
     """
-    response = model.chat.completions.create(
-        model="gpt-5-mini",
-        messages=[
-            {"role": "system", "content": prompt}
-        ],
-        # max_tokens=4000,
+    messages = []
+    extra_body = None
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+        extra_body = {"prompt_cache_key": hashlib.sha1(
+            system_prompt.encode('utf-8')).hexdigest()}
+        messages.append({"role": "user", "content": prompt})
+    else:
+        messages.append({"role": "system", "content": prompt})
+
+    request = dict(
+        model=model_name,
+        messages=messages,
+        extra_body=extra_body,
         # temperature=0.6,
     )
+    if max_completion_tokens:
+        request["max_completion_tokens"] = max_completion_tokens
+    if response_format:
+        request["response_format"] = response_format
+    return request
+
+
+def _batch_request_body(prompt, system_prompt=None, **options):
+    """The `_model_request` arguments as a Batch API request body."""
+    request = _model_request(prompt, system_prompt, **options)
+    body = {key: value for key, value in request.items()
+            if key != "extra_body"}
+    body.update(request.get("extra_body") or {})
+    return body
+
+
+def _is_truncated(finish_reason):
+    """
+    Reports output cut off by the token limit. Truncated output is treated as
+    a failed call: it is neither cached nor returned.
+    """
+    if finish_reason == "length":
+        print("Error: Model output hit the token limit and was truncated.")
+        return True
+    return False
+
+
+def _cache_path(request):
+    """Response cache file for a request, keyed by the hash of the full request."""
+    key = hashlib.sha256(_json_dumpb(request, sort_keys=True)).hexdigest()
+    return os.path.join(PROMPT_CACHE_DIR, f"{key}.txt")
+
+
+def _read_cached(path):
+    """Reads a cached response exactly as `_cache_put` wrote it (no newline translation)."""
+    with open(path, 'rb') as f:
+        return f.read().decode('utf-8')
+
+
+def _cache_get(request):
+    if not USE_PROMPT_CACHE:
+        return None
+    try:
+        return _read_cached(_cache_path(request))
+    except FileNotFoundError:
+        return None
+
+
+def _cache_put(request, content):
+    if not USE_PROMPT_CACHE or not content:
+        return
+    path = _cache_path(request)
+    os.makedirs(PROMPT_CACHE_DIR, exist_ok=True)
+    # Write then rename, so concurrent requests never see a partial entry
+    tmp_path = f"{path}.{os.getpid()}.{id(content)}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8', newline='') as f:
+        f.write(content)
+    os.replace(tmp_path, path)
+
+
+def _semantic_fingerprint(request):
+    """
+    Everything that must match exactly for a semantic hit: the REQ_IDs in the
+    prompt (so near-identical prompts for different requirements never share
+    a response), the part of the prompt past the embedded head (which the
+    embedding cannot see) and the rest of the request apart from the prompt.
+    """
+    prompt = request["messages"][-1]["content"]
+    rest = dict(request, messages=request["messages"][:-1])
+    return hashlib.sha256(_json_dumpb({
+        "req_ids": sorted(set(REQ_ID_RE.findall(prompt))),
+        "tail": hashlib.sha256(prompt[EMBEDDING_MAX_CHARS:].encode('utf-8')).hexdigest(),
+        "request": rest,
+    }, sort_keys=True)).hexdigest()
+
+
+def _embedding_input(request):
+    # The embedding model takes ~8k tokens; the rest of the prompt has to
+    # match exactly through the fingerprint.
+    return request["messages"][-1]["content"][:EMBEDDING_MAX_CHARS]
+
+
+def _normalize(vector):
+    norm = sum(x * x for x in vector) ** 0.5 or 1.0
+    return [x / norm for x in vector]
+
+
+def _semantic_index():
+    """Loads the semantic cache index (fingerprint, unit vector, response path) once."""
+    global _SEMANTIC_INDEX
+    if _SEMANTIC_INDEX is None:
+        _SEMANTIC_INDEX = []
+        try:
+            with open(SEMANTIC_INDEX_PATH, 'rb') as f:
+                for line in f:
+                    if line.strip():
+                        entry = _json_loads(line)
+                        _SEMANTIC_INDEX.append(
+                            (entry["fingerprint"], entry["embedding"], entry["path"]))
+        except FileNotFoundError:
+            pass
+    return _SEMANTIC_INDEX
+
+
+def _semantic_lookup(request, vector):
+    """Returns the cached response of the most similar prompt above the threshold."""
+    if vector is None:
+        return None
+    fingerprint = _semantic_fingerprint(request)
+    best_score, best_path = SEMANTIC_CACHE_THRESHOLD, None
+    for entry_fingerprint, entry_vector, path in _semantic_index():
+        if entry_fingerprint != fingerprint:
+            continue
+        score = sum(a * b for a, b in zip(vector, entry_vector))
+        if score >= best_score:
+            best_score, best_path = score, path
+    if best_path is None:
+        return None
+    try:
+        content = _read_cached(best_path)
+    except FileNotFoundError:
+        return None
+    print(f"Semantic cache hit (cosine similarity {best_score:.3f})")
+    return content
+
+
+def _semantic_add(request, vector):
+    entry = {
+        "fingerprint": _semantic_fingerprint(request),
+        "embedding": vector,
+        "path": _cache_path(request),
+    }
+    _semantic_index().append((entry["fingerprint"], vector, entry["path"]))
+    os.makedirs(PROMPT_CACHE_DIR, exist_ok=True)
+    with open(SEMANTIC_INDEX_PATH, 'ab') as f:
+        f.write(_json_dumpb(entry) + b"\n")
+
+
+def _embed(request):
+    """Embeds the prompt for the semantic cache, or returns None if that fails."""
+    try:
+        response = model.embeddings.create(
+            model=EMBEDDING_MODEL, input=_embedding_input(request))
+    except Exception as e:
+        # The cache is only an optimisation; fall through to a normal call
+        print(f"Warning: Semantic cache skipped, embedding failed: {e}")
+        return None
+    return _normalize(response.data[0].embedding)
+
+
+async def _aembed(request):
+    """Async variant of `_embed`."""
+    try:
+        response = await async_model.embeddings.create(
+            model=EMBEDDING_MODEL, input=_embedding_input(request))
+    except Exception as e:
+        print(f"Warning: Semantic cache skipped, embedding failed: {e}")
+        return None
+    return _normalize(response.data[0].embedding)
+
+
+def run_model(prompt, system_prompt=None, **options):
+    """
+    Runs the AI model with the given prompt and returns the response.
+    `options` (model_name, response_format) are passed to `_model_request`.
+    Responses are served from the on-disk prompt cache when possible.
+    """
+    request = _model_request(prompt, system_prompt, **options)
+    cached = _cache_get(request)
+    if cached is not None:
+        return cached
+    vector = None
+    if USE_PROMPT_CACHE and USE_SEMANTIC_CACHE:
+        vector = _embed(request)
+        cached = _semantic_lookup(request, vector)
+        if cached is not None:
+            return cached
+
+    response = model.chat.completions.create(**request)
+    # print Usage
+    print(response.usage)
+    if _is_truncated(response.choices[0].finish_reason):
+        return None
+    content = response.choices[0].message.content
+    _cache_put(request, content)
+    if vector is not None:
+        _semantic_add(request, vector)
+    return content
+
+
+def stream_model(prompt, out, system_prompt=None, **options):
+    """
+    Runs the AI model with streaming enabled, writing each delta to `out` as
+    it arrives instead of waiting for (and holding) the whole response.
+    A cached response is written to `out` directly.
+
+    Returns:
+        int: Number of characters written, or None if the output was truncated
+        (what was written to `out` so far is then incomplete).
+    """
+    request = _model_request(prompt, system_prompt, **options)
+    cached = _cache_get(request)
+    if cached is not None:
+        out.write(cached)
+        return len(cached)
+
+    stream = model.chat.completions.create(
+        **request,
+        stream=True,
+        stream_options={"include_usage": True},
+    )
+    deltas = []
+    truncated = False
+    for chunk in stream:
+        if chunk.usage:
+            # print Usage
+            print(chunk.usage)
+        if not chunk.choices:
+            continue
+        truncated = _is_truncated(chunk.choices[0].finish_reason) or truncated
+        delta = chunk.choices[0].delta.content
+        if delta:
+            out.write(delta)
+            deltas.append(delta)
+    if truncated:
+        return None
+    content = "".join(deltas)
+    _cache_put(request, content)
+    return len(content)
+
+
+async def arun_model(prompt, system_prompt=None, semaphore=None, **options):
+    """
+    Async variant of `run_model`. An optional semaphore bounds the number of
+    requests in flight to stay within the API rate limits.
+    """
+    request = _model_request(prompt, system_prompt, **options)
+    cached = _cache_get(request)
+    if cached is not None:
+        return cached
+
+    async with semaphore or contextlib.nullcontext():
+        vector = None
+        if USE_PROMPT_CACHE and USE_SEMANTIC_CACHE:
+            vector = await _aembed(request)
+            cached = _semantic_lookup(request, vector)
+            if cached is not None:
+                return cached
+        response = await async_model.chat.completions.create(**request)
     # print Usage
     print(response.usage)
-    return response.choices[0].message.content
+    if _is_truncated(response.choices[0].finish_reason):
+        return None
+    content = response.choices[0].message.content
+    _cache_put(request, content)
+    if vector is not None:
+        _semantic_add(request, vector)
+    return content
+
+
+def _dedup(existing, new):
+    """Union of two lists of dicts, keyed by their canonical JSON form."""
+    seen = {}
+    for d in (*existing, *new):
+        seen.setdefault(_json_dumpb(d, sort_keys=True), d)
+    return list(seen.values())
+
+
+try:
+    # Optional compiled kernel, only if prebuilt with `cythonize -i _merge.pyx`;
+    # building on import would load the Cython compiler on every run.
+    from _merge import dedup_dicts as _dedup
+except ImportError:
+    pass
+
+
+def _merge_component(component_map, component):
+    """Merges a single UI component into `component_map`, keyed by selector."""
+    selector = component.get("selector")
+    if not selector:  # Skip components without a selector
+        return
+
+    if selector not in component_map:
+        # Copy the top-level lists we mutate to avoid modifying original data
+        merged = dict(component)
+        merged["actions"] = list(component.get("actions", []))
+        merged["fields"] = list(component.get("fields", []))
+        merged["error_messages"] = list(
+            component.get("error_messages", []))
+        component_map[selector] = merged
+    else:
+        # Merge existing component with new one
+        existing_component = component_map[selector]
+
+        # Merge actions and fields (assuming they are lists of dicts)
+        existing_component["actions"] = _dedup(
+            existing_component.get("actions", []), component.get("actions", []))
+        existing_component["fields"] = _dedup(
+            existing_component.get("fields", []), component.get("fields", []))
+
+        # If an error div with text is present, record its text and
+        # mark the component as conditional
+        # `classes` is the class attribute string (or a list); a single `in`
+        # test covers both, so it is not converted to a set first
+        classes = component.get("classes") or ()
+        text = component.get("text")
+        if text and "error" in classes:
+            error_text = text.strip()
+            if error_text and error_text not in existing_component["error_messages"]:
+                existing_component["error_messages"].append(error_text)
+            existing_component["conditional"] = True
 
 
 def merge_ui_jsons(ui_json_list):
@@ -223,62 +725,131 @@ def merge_ui_jsons(ui_json_list):
             merged_page_data["pageUrl"] = page_data["pageUrl"]
 
         for component in page_data.get("components", []):
-            selector = component.get("selector")
-            if not selector:  # Skip components without a selector
-                continue
+            _merge_component(component_map, component)
 
-            if selector not in component_map:
-                # Deep copy the component to avoid modifying original data
-                component_map[selector] = json.loads(json.dumps(component))
-                # Initialize error_messages if not present
-                if "error_messages" not in component_map[selector]:
-                    component_map[selector]["error_messages"] = []
-            else:
-                # Merge existing component with new one
-                existing_component = component_map[selector]
-
-                # Merge actions and fields (assuming they are lists of dicts)
-                existing_actions = {
-                    frozenset(d.items()) for d in existing_component.get("actions", [])}
-                new_actions = {frozenset(d.items())
-                               for d in component.get("actions", [])}
-                merged_actions = existing_actions.union(new_actions)
-                existing_component["actions"] = [
-                    dict(s) for s in merged_actions]
-
-                existing_fields = {
-                    frozenset(d.items()) for d in existing_component.get("fields", [])}
-                new_fields = {frozenset(d.items())
-                              for d in component.get("fields", [])}
-                merged_fields = existing_fields.union(new_fields)
-                existing_component["fields"] = [dict(s) for s in merged_fields]
-
-                # Handle error messages: if an error div is present, add its text
-                if component.get("classes") and "error" in component["classes"] and component.get("text"):
-                    error_text = component["text"].strip()
-                    if error_text and error_text not in existing_component["error_messages"]:
-                        existing_component["error_messages"].append(error_text)
-
-                # If a component is an error type and has text, mark it as conditional
-                if component.get("classes") and "error" in component["classes"] and component.get("text"):
-                    existing_component["conditional"] = True
+    # Convert map back to list for the merged_page_data
+    merged_page_data["components"] = list(component_map.values())
+    return merged_page_data
+
+
+def merge_ui_files(ui_json_paths):
+    """
+    Same as `merge_ui_jsons`, but reads the UI JSON files itself. With ijson
+    installed, components are streamed straight into the merge so a file's
+    full tree is never materialised; otherwise each file is loaded whole.
+    """
+    if ijson is None:
+        parsed_ui_jsons = []
+        for ui_path in ui_json_paths:
+            with open(ui_path, 'rb') as f:
+                parsed_ui_jsons.append(_json_loads(f.read()))
+        return merge_ui_jsons(parsed_ui_jsons)
+
+    merged_page_data = {"pageUrl": "", "components": []}
+    component_map = {}
+
+    for ui_path in ui_json_paths:
+        with open(ui_path, 'rb') as f:
+            if not merged_page_data["pageUrl"]:
+                for page_url in ijson.items(f, 'pageUrl'):
+                    merged_page_data["pageUrl"] = page_url
+                    break
+                f.seek(0)
+            for component in ijson.items(f, 'components.item', use_float=True):
+                _merge_component(component_map, component)
 
     # Convert map back to list for the merged_page_data
     merged_page_data["components"] = list(component_map.values())
     return merged_page_data
 
 
-def pdf_extraction(pdf_path):
+def _extract_pages(args):
+    """
+    Worker for `iter_pdf_pages`: extracts the text of pages [start, stop).
+    Each worker opens the PDF itself so nothing heavy crosses the process boundary.
+    """
+    pdf_path, start, stop, skip_image_pages = args
+    parts = []
+    if HAS_PYMUPDF:
+        import pymupdf
+        with pymupdf.open(pdf_path) as doc:
+            for page_no in range(start, stop):
+                # Image-only pages come back empty without any layout work
+                page_text = doc[page_no].get_text("text")
+                if page_text.strip():
+                    parts.append((page_no + 1, page_text))
+        return parts
+
+    import pdfplumber
+    with pdfplumber.open(pdf_path, pages=range(start + 1, stop + 1)) as pdf:
+        for page_no, page in enumerate(pdf.pages, start + 1):
+            if skip_image_pages and not page.chars:
+                continue
+            # extract_text() returns None for image-only pages
+            page_text = page.extract_text()
+            if page_text:
+                parts.append((page_no, page_text))
+    return parts
+
+
+def iter_pdf_pages(pdf_path, skip_image_pages=True, workers=None):
     """
-    Placeholder function to extract text from a PDF.
+    Yields `(page_no, text)` for each page of a PDF that has text, in page order.
+
+    Text is extracted with PyMuPDF (MuPDF, C) when installed, and with
+    pdfplumber otherwise. Pages are split into contiguous ranges and extracted
+    in parallel with a process pool (`workers` defaults to the CPU count, or
+    1 with PyMuPDF); pages are yielded as soon as their range is done, so
+    callers can start consuming early. With pdfplumber, pages without any character objects
+    (scanned/image-only pages) are skipped before running text layout when
+    `skip_image_pages` is set; PyMuPDF returns no text for them cheaply.
+
+    Pages are not kept after they are yielded, so callers decide how much of
+    the document is held in memory.
+    """
+    page_count = _pdf_page_count(pdf_path)
+
+    if workers is None:
+        # MuPDF extracts a few hundred pages faster than a spawned pool starts
+        workers = 1 if HAS_PYMUPDF else os.cpu_count() or 1
+    workers = max(1, min(workers, page_count))
+    # A few ranges per worker keeps the load balanced without reopening
+    # the PDF for every single page.
+    chunk = max(1, -(-page_count // (4 * workers)))
+    tasks = [(pdf_path, start, min(start + chunk, page_count), skip_image_pages)
+             for start in range(0, page_count, chunk)]
+
+    if workers == 1:
+        for task in tasks:
+            yield from _extract_pages(task)
+        return
+    # Spawn rather than fork: the chunked parser drives this generator from a
+    # worker thread while the event loop and HTTP clients are running.
+    with ProcessPoolExecutor(max_workers=workers,
+                             mp_context=multiprocessing.get_context("spawn")) as executor:
+        for parts in executor.map(_extract_pages, tasks):
+            yield from parts
+
+
+def _pdf_page_count(pdf_path):
+    if HAS_PYMUPDF:
+        import pymupdf
+        if not os.path.isfile(pdf_path):
+            raise FileNotFoundError(pdf_path)
+        with pymupdf.open(pdf_path) as doc:
+            return doc.page_count
+    import pdfplumber
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def pdf_extraction(pdf_path, skip_image_pages=True, workers=None):
+    """
+    Extracts text from a PDF. See `iter_pdf_pages` for the options.
     """
     print(f"Extracting text from PDF at {pdf_path}...")
     try:
-        with pdfplumber.open(pdf_path) as pdf:
-            text = ""
-            for page in pdf.pages:
-                text += page.extract_text() + "\n"
-            return text
+        return "\n".join(text for _, text in iter_pdf_pages(pdf_path, skip_image_pages, workers))
     except FileNotFoundError:
         print(f"Error: PDF file not found at {pdf_path}")
         return None
@@ -287,12 +858,145 @@ def pdf_extraction(pdf_path):
         return None
 
 
+def chunk_srs_text(page_texts, max_chars):
+    """
+    Groups streamed page texts into chunks of roughly `max_chars`, cutting at
+    numbered section headings so a subsection is never split across chunks.
+    A chunk only grows past `max_chars` when no heading is found to cut at.
+    """
+    buffer = ""
+    for text in page_texts:
+        buffer = f"{buffer}\n{text}" if buffer else text
+        while len(buffer) >= max_chars:
+            cuts = [m.start() for m in SECTION_HEADING_RE.finditer(buffer) if m.start() > 0]
+            if not cuts:
+                break
+            # Prefer the last heading that keeps the chunk within budget
+            within = [c for c in cuts if c <= max_chars]
+            cut = within[-1] if within else cuts[0]
+            yield buffer[:cut]
+            buffer = buffer[cut:]
+    if buffer:
+        yield buffer
+
+
+def _srs_sections(data):
+    """
+    Returns the section list of parsed SRS JSON, wrapped ({"Sections": [...]})
+    or bare. Any other shape (e.g. another root key) raises ValueError rather
+    than passing for an empty document.
+    """
+    if isinstance(data, dict):
+        if "Sections" not in data:
+            raise ValueError(
+                f'SRS JSON has no "Sections" key (root keys: {", ".join(data) or "none"})')
+        data = data["Sections"]
+    if not isinstance(data, list):
+        raise ValueError("SRS JSON sections are not an array")
+    return data
+
+
+def _merge_section_responses(responses):
+    """
+    Merges the JSON sections returned for each chunk into a single document.
+    A section continued from the previous chunk gets its Sub_Sections appended.
+    """
+    sections = []
+    for response in responses:
+        for section in _srs_sections(_json_loads(response)):
+            if sections and sections[-1].get("Section_ID") == section.get("Section_ID"):
+                sections[-1].setdefault("Sub_Sections", []).extend(
+                    section.get("Sub_Sections", []))
+            else:
+                sections.append(section)
+    return _json_dumps({"Sections": sections}, indent=True)
+
+
+async def _aparse_srs_chunks(pdf_path, chunk_chars):
+    """
+    Issues one model request per section-aligned chunk as soon as the chunk has
+    been extracted, and gathers the responses in chunk order.
+    """
+    semaphore = asyncio.Semaphore(MODEL_CONCURRENCY)
+    page_texts = (text for _, text in iter_pdf_pages(pdf_path))
+    chunks = chunk_srs_text(page_texts, chunk_chars)
+    tasks = []
+    async with async_model_session():
+        # Extraction is blocking, so pull chunks in a thread and keep the loop
+        # free for the requests already in flight.
+        while (chunk := await asyncio.to_thread(next, chunks, None)) is not None:
+            tasks.append(asyncio.create_task(arun_model(
+                PARSER_INPUT.render(context=chunk), MASTER_PARSER_PROMPT, semaphore,
+                **PARSER_OPTIONS)))
+        return await asyncio.gather(*tasks)
+
+
+def _parse_srs_chunks(pdf_path, chunk_chars):
+    """
+    Sends the SRS to the model in section-aligned chunks while the PDF is still
+    being extracted, so extraction overlaps with the (network-bound) model calls.
+    """
+    print(f"Extracting text from PDF at {pdf_path}...")
+    try:
+        responses = asyncio.run(_aparse_srs_chunks(pdf_path, chunk_chars))
+    except FileNotFoundError:
+        print(f"Error: PDF file not found at {pdf_path}")
+        return None
+    except Exception as e:
+        print(f"Error parsing SRS chunks: {e}")
+        return None
+
+    if not responses or not all(responses):
+        return None
+    try:
+        return _merge_section_responses(responses)
+    except Exception as e:
+        print(f"Error merging SRS chunk responses: {e}")
+        return None
+
+
+def _read_text(full_path):
+    """
+    Reads a UTF-8 text file with raw os.open/os.read into a buffer sized from
+    fstat, skipping the buffered text-mode reader. Newlines are normalised to
+    `\n` like text mode does.
+    """
+    fd = os.open(full_path, os.O_RDONLY | getattr(os, "O_BINARY", 0))
+    try:
+        remaining = os.fstat(fd).st_size
+        chunks = []
+        while True:
+            chunk = os.read(fd, max(remaining, 1 << 16))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            remaining -= len(chunk)
+    finally:
+        os.close(fd)
+    data = b"".join(chunks).decode('utf-8')
+    if "\r" in data:
+        data = data.replace("\r\n", "\n").replace("\r", "\n")
+    return data
+
+
+# Example file contents keyed by full path, as (st_mtime_ns, content)
+_EXAMPLE_CACHE = {}
+
+
 def read_file_content(base_path, file_path):
-    """Safely reads content of a file."""
+    """
+    Safely reads content of a file. Contents are cached and only re-read
+    when the file's mtime changes.
+    """
     full_path = os.path.join(base_path, file_path)
     try:
-        with open(full_path, 'r', encoding='utf-8') as f:
-            return f.read()
+        mtime = os.stat(full_path).st_mtime_ns
+        cached = _EXAMPLE_CACHE.get(full_path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        content = _read_text(full_path)
+        _EXAMPLE_CACHE[full_path] = (mtime, content)
+        return content
     except FileNotFoundError:
         print(
             f"Warning: Example file not found at {full_path}. Prompt will be less detailed.")
@@ -302,61 +1006,168 @@ def read_file_content(base_path, file_path):
         return f"// Error reading example file: {file_path}"
 
 
-def generate_test_prompt(srs_json_path, ui_json_paths, prefix="src/test/java/com/sdp/m1"):
+def _example_paths(prefix):
+    """Example file paths, relative to the project root, keyed by their template placeholder."""
+    return {
+        "feature_example": 'src/test/resources/Features/service_provider_registration.feature',
+        "page_object_example": f'{prefix}/Pages/ServiceProviderRegistrationPage.java',
+        "steps_example": f'{prefix}/Steps/ServiceProviderRegistrationSteps.java',
+        "configs_example": f'{prefix}/Utils/TestConfigs.java',
+        "utils_example": f'{prefix}/Utils/TestUtils.java',
+        "hooks_example": f'{prefix}/Hooks/Hooks.java',
+    }
+
+
+def _load_examples_bulk(project_root, prefix):
+    """Reads all example files in one pass, keyed by their template placeholder."""
+    return {key: read_file_content(project_root, path)
+            for key, path in _example_paths(prefix).items()}
+
+
+def example_mtimes(prefix="src/test/java/com/sdp/m1"):
     """
-    Generates a comprehensive prompt for AI-powered test generation.
+    Returns the mtime (ns) of each example file keyed by its path, or None for
+    missing files. Used to tell whether a compiled prompt prefix is stale.
+    """
+    mtimes = {}
+    for path in _example_paths(prefix).values():
+        try:
+            mtimes[path] = os.stat(os.path.join(os.getcwd(), path)).st_mtime_ns
+        except OSError:
+            mtimes[path] = None
+    return mtimes
+
+
+def prompt_template_hash():
+    """SHA-1 of MASTER_PROMPT_PREFIX_TEMPLATE, so a compiled prefix is rebuilt when it changes."""
+    return hashlib.sha1(MASTER_PROMPT_PREFIX_TEMPLATE.encode('utf-8')).hexdigest()
+
+
+def load_examples(prefix="src/test/java/com/sdp/m1"):
+    """
+    Reads the example files embedded in the master prompt. Unchanged files
+    are served from the cache in `read_file_content`.
+
+    Returns:
+        dict: Example contents keyed by their MASTER_PROMPT_TEMPLATE placeholder.
+    """
+    # Assuming the script is run from the project root.
+    return _load_examples_bulk(os.getcwd(), prefix)
+
+
+# Rendered static prompt prefix per examples prefix, as (example mtimes, prefix)
+_PROMPT_PREFIXES = {}
+
+
+def _load_compiled_prefix(prefix, mtimes):
+    """
+    Returns the prefix prebuilt by compile_prefix.py, or None when there is
+    none or it is stale (other examples prefix, edited template or example
+    files, whose current `mtimes` are given).
+    """
+    if _compiled_prefix is None or _compiled_prefix.EXAMPLES_PREFIX != prefix:
+        return None
+    if _compiled_prefix.TEMPLATE_SHA1 != prompt_template_hash():
+        return None
+    if _compiled_prefix.EXAMPLE_MTIMES != mtimes:
+        return None
+    return _compiled_prefix.PREFIX
+
+
+def load_prompt_prefix(prefix="src/test/java/com/sdp/m1"):
+    """
+    Returns the static part of the master prompt (role, examples and
+    instructions). A prefix compiled ahead of time by compile_prefix.py is
+    used when it is up to date; otherwise it is rendered from the example
+    files. The result is kept until an example file's mtime changes, so later
+    prompts only format the SRS/UI context, and an edited example is only
+    re-read on its own (the others come from `read_file_content`'s cache).
+    """
+    # Taken before reading, so an example edited meanwhile is picked up next time
+    mtimes = example_mtimes(prefix)
+    cached = _PROMPT_PREFIXES.get(prefix)
+    if cached is not None and cached[0] == mtimes:
+        return cached[1]
+    prompt_prefix = _load_compiled_prefix(prefix, mtimes)
+    if prompt_prefix is None:
+        prompt_prefix = PROMPT_PREFIX.render(**load_examples(prefix))
+    _PROMPT_PREFIXES[prefix] = (mtimes, prompt_prefix)
+    return prompt_prefix
+
+
+def prepare_ui_context(ui_json_paths):
+    """
+    Reads and merges the UI JSON files into the string embedded in the prompt.
 
     Args:
-        srs_json_path (str): Path to the SRS JSON file.
         ui_json_paths (list): List of paths to the UI components JSON files.
 
     Returns:
-        str: The formatted master prompt with all context included.
+        str: The merged page structure as JSON, or None on error.
+    """
+    try:
+        merged_ui_data = merge_ui_files(ui_json_paths)
+        # Compact JSON: indentation only costs tokens for the model
+        return _json_dumps(merged_ui_data)
+    except FileNotFoundError as e:
+        print(f"Error: Input file not found - {e}")
+        return None
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return None
+
+
+def _prune_empty(value):
+    """Recursively drops null, empty-list and empty-object values from dicts."""
+    if isinstance(value, dict):
+        pruned = {}
+        for key, item in value.items():
+            item = _prune_empty(item)
+            if item is not None and item != [] and item != {}:
+                pruned[key] = item
+        return pruned
+    if isinstance(value, list):
+        return [_prune_empty(item) for item in value]
+    return value
+
+
+def _read_srs_context(srs_json_path):
     """
+    Reads an SRS section and minifies it for the prompt: compact separators,
+    and no empty arrays/nulls (the parser keeps them, but test generation does
+    not need them). Files that are not valid JSON are inlined as-is.
+    """
+    srs_content = _read_text(srs_json_path)
     try:
-        # Assuming the script is run from the project root.
-        project_root = os.getcwd()
-
-        # Read example files
-        feature_example = read_file_content(
-            project_root, 'src/test/resources/Features/service_provider_registration.feature')
-        page_object_example = read_file_content(
-            project_root, f'{prefix}/Pages/ServiceProviderRegistrationPage.java')
-        steps_example = read_file_content(
-            project_root, f'{prefix}/Steps/ServiceProviderRegistrationSteps.java')
-        configs_example = read_file_content(
-            project_root, f'{prefix}/Utils/TestConfigs.java')
-        utils_example = read_file_content(
-            project_root, f'{prefix}/Utils/TestUtils.java')
-        Hooks_example = read_file_content(
-            project_root, f'{prefix}/Hooks/Hooks.java')
+        return _json_dumps(_prune_empty(_json_loads(srs_content)))
+    except ValueError:
+        return srs_content
+
+
+def generate_test_messages(srs_json_path, ui_content, prompt_prefix):
+    """
+    Generates the master prompt as a static prefix and a per-feature context.
+
+    Args:
+        srs_json_path (str): Path to the SRS JSON file.
+        ui_content (str): Merged UI JSON, as returned by `prepare_ui_context`.
+        prompt_prefix (str): Static prompt prefix, as returned by `load_prompt_prefix`.
 
+    Returns:
+        tuple: The static prompt prefix (suitable as a cached system message)
+            and the per-feature context, or None on error.
+    """
+    try:
         # Read task-specific files
-        with open(srs_json_path, 'r', encoding='utf-8') as f:
-            srs_content = f.read()
+        srs_content = _read_srs_context(srs_json_path)
 
-        # Read and merge all UI JSON files
-        parsed_ui_jsons = []
-        for ui_path in ui_json_paths:
-            with open(ui_path, 'r', encoding='utf-8') as f:
-                parsed_ui_jsons.append(json.load(f))
-
-        merged_ui_data = merge_ui_jsons(parsed_ui_jsons)
-        ui_content = json.dumps(merged_ui_data, indent=4)
-
-        # Format the master prompt with all the context
-        final_prompt = MASTER_PROMPT_TEMPLATE.format(
-            feature_example=feature_example,
-            page_object_example=page_object_example,
-            steps_example=steps_example,
-            configs_example=configs_example,
-            utils_example=utils_example,
+        # Only the per-feature context is formatted; the prefix is reused
+        context_prompt = PROMPT_CONTEXT.render(
             srs_json=srs_content,
-            ui_json=ui_content,
-            hooks_example=Hooks_example
+            ui_json=ui_content
         )
 
-        return final_prompt
+        return prompt_prefix, context_prompt
     except FileNotFoundError as e:
         print(f"Error: Input file not found - {e}")
         return None
@@ -365,56 +1176,361 @@ def generate_test_prompt(srs_json_path, ui_json_paths, prefix="src/test/java/com
         return None
 
 
-def srs_to_json(pdf_path, split=False):
+def generate_test_prompt(srs_json_path, ui_content, prompt_prefix):
     """
-    Placeholder function to convert SRS PDF to JSON.
+    Generates a comprehensive prompt for AI-powered test generation.
+
+    Args:
+        srs_json_path (str): Path to the SRS JSON file.
+        ui_content (str): Merged UI JSON, as returned by `prepare_ui_context`.
+        prompt_prefix (str): Static prompt prefix, as returned by `load_prompt_prefix`.
+
+    Returns:
+        str: The formatted master prompt with all context included.
     """
-    print(f"Converting SRS PDF at {pdf_path}...")
+    messages = generate_test_messages(srs_json_path, ui_content, prompt_prefix)
+    if messages is None:
+        return None
+    return "".join(messages)
+
+
+def emit_test_prompt(out, srs_json_path, ui_content, prompt_prefix):
+    """
+    Writes the master prompt straight to `out` (e.g. `sys.stdout`) without
+    building the full prompt string in memory first.
+
+    Args:
+        out: A writable text stream.
+        srs_json_path (str): Path to the SRS JSON file.
+        ui_content (str): Merged UI JSON, as returned by `prepare_ui_context`.
+        prompt_prefix (str): Static prompt prefix, as returned by `load_prompt_prefix`.
+
+    Returns:
+        bool: True if the prompt was written.
+    """
+    try:
+        srs_content = _read_srs_context(srs_json_path)
+    except FileNotFoundError as e:
+        print(f"Error: Input file not found - {e}")
+        return False
+    except Exception as e:
+        print(f"An unexpected error occurred: {e}")
+        return False
+
+    out.write(prompt_prefix)
+    PROMPT_CONTEXT.emit(out, srs_json=srs_content, ui_json=ui_content)
+    return True
+
 
+def _srs_parser_input(pdf_path):
+    """
+    Renders the parser user message for a whole PDF. The joined page text only
+    lives inside this call, so just one copy of the document is held while
+    the model request runs.
+    """
     pdf_text = pdf_extraction(pdf_path)
     if not pdf_text:
         return None
+    return PARSER_INPUT.render(context=pdf_text)
 
-    response = run_model(MASTER_PARSER_PROMPT.format(context=pdf_text))
-    output_path = os.path.splitext(pdf_path)[0] + ".json"
-    with open(output_path, 'w', encoding='utf-8') as f:
-        # json.dump(response, f, indent=4)
-        if response:
-            f.write(response)
-            if split:
-                split_srs_json(pdf_path, response)
+
+def _find_batch_pairs(batch_dir):
+    """Pairs every `<name>.srs.json` in batch_dir with its `<name>.ui.json`."""
+    pairs = []
+    for srs_path in sorted(glob.glob(os.path.join(batch_dir, "*.srs.json"))):
+        name = os.path.basename(srs_path)[:-len(".srs.json")]
+        ui_path = os.path.join(batch_dir, f"{name}.ui.json")
+        if os.path.isfile(ui_path):
+            pairs.append((name, srs_path, ui_path))
         else:
+            print(f"Warning: No UI JSON found for {srs_path}, skipping.")
+    return pairs
+
+
+async def _agenerate_tests(message_pairs):
+    semaphore = asyncio.Semaphore(MODEL_CONCURRENCY)
+    async with async_model_session():
+        return await asyncio.gather(
+            *(arun_model(prompt_context, prompt_prefix, semaphore)
+              for prompt_prefix, prompt_context in message_pairs),
+            return_exceptions=True)
+
+
+def generate_tests_batch(batch_dir, prefix="src/test/java/com/sdp/m1"):
+    """
+    Generates test artifacts for every SRS/UI pair in a directory.
+
+    Prompts are built in a thread pool, then all model requests are issued
+    concurrently (bounded by MODEL_CONCURRENCY). Each response is written to
+    `<name>.generated.md` next to its inputs.
+
+    Returns:
+        list: Paths of the files written.
+    """
+    pairs = _find_batch_pairs(batch_dir)
+    if not pairs:
+        print(f"Error: No *.srs.json / *.ui.json pairs found in {batch_dir}")
+        return []
+
+    prompt_prefix = load_prompt_prefix(prefix)
+
+    def build(pair):
+        _, srs_path, ui_path = pair
+        ui_content = prepare_ui_context([ui_path])
+        if ui_content is None:
+            return None
+        return generate_test_messages(srs_path, ui_content, prompt_prefix)
+
+    with ThreadPoolExecutor() as executor:
+        built = list(executor.map(build, pairs))
+    jobs = [(name, messages)
+            for (name, _, _), messages in zip(pairs, built) if messages]
+
+    responses = asyncio.run(_agenerate_tests(
+        [messages for _, messages in jobs]))
+
+    output_paths = []
+    for (name, _), response in zip(jobs, responses):
+        if isinstance(response, Exception) or not response:
+            print(f"Error: Test generation failed for {name}: {response}")
+            continue
+        output_path = os.path.join(batch_dir, f"{name}.generated.md")
+        with open(output_path, 'w', encoding='utf-8') as f:
+            f.write(response)
+        print(f"Created {output_path}")
+        output_paths.append(output_path)
+    return output_paths
+
+
+def srs_to_json(pdf_path, split=False, chunk_chars=None):
+    """
+    Converts an SRS PDF to JSON.
+
+    When `chunk_chars` is set, the SRS is parsed in section-aligned chunks of
+    about that many characters, issued concurrently as pages are extracted.
+    """
+    print(f"Converting SRS PDF at {pdf_path}...")
+
+    if chunk_chars:
+        response = _parse_srs_chunks(pdf_path, chunk_chars)
+        return _save_srs_json(pdf_path, response, split)
+
+    parser_input = _srs_parser_input(pdf_path)
+    if not parser_input:
+        return None
+
+    # Stream the response into a temp file and only replace the previous
+    # output once it is complete, so a failed call never clobbers a good file.
+    output_path = os.path.splitext(pdf_path)[0] + ".json"
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            written = stream_model(
+                parser_input, f, MASTER_PARSER_PROMPT, **PARSER_OPTIONS)
+        if not written:
             print("Error: No response from model.")
             return None
+        with open(tmp_path, 'rb') as f:
+            if not _is_srs_json(f.read()):
+                return None
+        os.replace(tmp_path, output_path)
+    except Exception as e:
+        # Reported per PDF, like the chunked path, so the remaining PDFs still run
+        print(f"Error parsing SRS: {e}")
+        return None
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
 
     print(f"SRS JSON saved to {output_path}")
+    if split:
+        split_srs_json(output_path)
 
     return output_path
 
 
+def _is_srs_json(data):
+    """Checks a model response is SRS JSON with a section list before it replaces any output."""
+    try:
+        _srs_sections(_json_loads(data))
+        return True
+    except ValueError as e:
+        print(f"Error: Model response is not usable SRS JSON: {e}")
+        return False
+
+
+def _save_srs_json(pdf_path, response, split=False):
+    """Writes the model's SRS JSON next to the PDF, optionally splitting it."""
+    if not response:
+        print("Error: No response from model.")
+        return None
+    if not _is_srs_json(response):
+        return None
+
+    output_path = os.path.splitext(pdf_path)[0] + ".json"
+    # Write then rename, so an interrupted write never leaves a partial file
+    tmp_path = f"{output_path}.{os.getpid()}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        f.write(response)
+    os.replace(tmp_path, output_path)
+
+    print(f"SRS JSON saved to {output_path}")
+    if split:
+        split_srs_json(pdf_path, response)
+
+    return output_path
+
+
+def srs_to_json_batch(pdf_paths, split=False, poll_interval=30):
+    """
+    Converts several SRS PDFs to JSON through the OpenAI Batch API.
+
+    One chat completion request per PDF is uploaded as a JSONL file and run as
+    a batch (half price, 24h completion window); this blocks, polling every
+    `poll_interval` seconds, until the batch finishes.
+
+    Returns:
+        list: Paths of the SRS JSON files written.
+    """
+    lines = []
+    submitted = []
+    # custom_id is the PDF path and must be unique within a batch
+    for pdf_path in dict.fromkeys(pdf_paths):
+        print(f"Converting SRS PDF at {pdf_path}...")
+        parser_input = _srs_parser_input(pdf_path)
+        if not parser_input:
+            continue
+        submitted.append(pdf_path)
+        lines.append(_json_dumpb({
+            "custom_id": pdf_path,
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": _batch_request_body(parser_input, MASTER_PARSER_PROMPT, **PARSER_OPTIONS),
+        }))
+    if not lines:
+        return []
+
+    batch_input = model.files.create(
+        file=("srs_batch.jsonl", b"\n".join(lines)), purpose="batch")
+    batch = model.batches.create(
+        input_file_id=batch_input.id,
+        endpoint="/v1/chat/completions",
+        completion_window="24h",
+    )
+    print(f"Submitted batch {batch.id} with {len(lines)} request(s)")
+
+    while batch.status not in ("completed", "failed", "expired", "cancelled"):
+        time.sleep(poll_interval)
+        batch = model.batches.retrieve(batch.id)
+        print(f"Batch {batch.id}: {batch.status} {batch.request_counts}")
+
+    if batch.status != "completed":
+        print(f"Error: Batch {batch.id} ended with status {batch.status}")
+        return []
+
+    answered = set()
+    # Requests that failed inside a completed batch only appear in the error file
+    for result in _batch_results(batch.error_file_id):
+        answered.add(result["custom_id"])
+        _report_batch_error(result)
+
+    output_paths = []
+    for result in _batch_results(batch.output_file_id):
+        pdf_path = result["custom_id"]
+        answered.add(pdf_path)
+        response = result.get("response") or {}
+        if result.get("error") or response.get("status_code") != 200:
+            _report_batch_error(result)
+            continue
+        body = response["body"]
+        print(body.get("usage"))
+        if _is_truncated(body["choices"][0].get("finish_reason")):
+            print(f"Error: Batch output for {pdf_path} is incomplete; not saved.")
+            continue
+        output_path = _save_srs_json(
+            pdf_path, body["choices"][0]["message"]["content"], split)
+        if output_path:
+            output_paths.append(output_path)
+
+    for pdf_path in submitted:
+        if pdf_path not in answered:
+            print(f"Error: Batch {batch.id} returned no result for {pdf_path}")
+    return output_paths
+
+
+def _batch_results(file_id):
+    """Yields the parsed lines of a Batch API output or error file, if any."""
+    if not file_id:
+        return
+    # orjson parses the raw bytes of each JSONL line without decoding first
+    for line in model.files.content(file_id).content.splitlines():
+        if line.strip():
+            yield _json_loads(line)
+
+
+def _report_batch_error(result):
+    response = result.get("response") or {}
+    error = result.get("error") or (response.get("body") or {}).get("error")
+    print(f"Error: Batch request for {result['custom_id']} failed "
+          f"(status {response.get('status_code')}): {error}")
+
+
+def _write_section(section, output_dir):
+    """Writes one SRS section to `<Section_ID>-<Section_Name>.json` in output_dir."""
+    section_id = section.get("Section_ID", "N/A")
+    section_name = section.get(
+        "Section_Name", "Unnamed").replace(" ", "_")
+    filename = os.path.join(
+        output_dir, f"{section_id}-{section_name}.json")
+    with open(filename, 'wb', buffering=1 << 20) as outfile:
+        outfile.write(_json_dumpb(section, indent=True))
+    print(f"Created {filename}")
+
+
+def _iter_sections(source):
+    """
+    Yields the sections of SRS JSON read from a seekable binary file object,
+    either a bare array or wrapped as {"Sections": [...]}. With ijson installed
+    they are streamed one at a time, so only the current section is held in
+    memory.
+    """
+    if ijson is None:
+        yield from _srs_sections(_json_loads(source.read()))
+        return
+
+    start = source.tell()
+    wrapped = source.read(4096).lstrip()[:1] == b"{"
+    source.seek(start)
+    prefix = 'Sections.item' if wrapped else 'item'
+    found = False
+    for section in ijson.items(source, prefix, use_float=True):
+        found = True
+        yield section
+    if wrapped and not found:
+        # Nothing under "Sections": tell an empty array from a missing key
+        source.seek(start)
+        if not any(event == 'map_key' and value == 'Sections'
+                   for path, event, value in ijson.parse(source) if path == ''):
+            raise ValueError('SRS JSON has no "Sections" key')
+
+
 def split_srs_json(json_path, data_str=None):
     """
-    splits a JSON file containing an array of sections into individual files.
+    splits a JSON file containing an array of sections (bare, or under a
+    "Sections" key) into individual files.
     """
     try:
         if data_str is not None:
-            data = json.loads(data_str)
+            source = io.BytesIO(data_str.encode('utf-8'))
         else:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-
-        output_dir = os.path.splitext(json_path)[0] + "_sections"
-        os.makedirs(output_dir, exist_ok=True)
-
-        for section in data:
-            section_id = section.get("Section_ID", "N/A")
-            section_name = section.get(
-                "Section_Name", "Unnamed").replace(" ", "_")
-            filename = os.path.join(
-                output_dir, f"{section_id}-{section_name}.json")
-            with open(filename, 'w', encoding='utf-8') as outfile:
-                json.dump(section, outfile, indent=4)
-            print(f"Created {filename}")
+            source = open(json_path, 'rb')
+
+        with source:
+            output_dir = os.path.splitext(json_path)[0] + "_sections"
+            for section in _iter_sections(source):
+                # Created on the first section, so a bad document leaves no empty dir
+                os.makedirs(output_dir, exist_ok=True)
+                _write_section(section, output_dir)
 
         print(f"splited JSON sections into {output_dir}")
         return output_dir
@@ -426,23 +1542,78 @@ def split_srs_json(json_path, data_str=None):
         return None
 
 
-def main():
+def _validate_args(parser, args):
     """
-    Main function to generate a comprehensive prompt for AI-powered test generation.
+    Rejects inconsistent flag combinations and missing input files up front,
+    before any PDF is parsed or model call is made.
     """
+    if args.semantic_cache and args.no_cache:
+        parser.error("--semantic-cache cannot be combined with --no-cache.")
+    calls_model = args.srs2json or args.batch_dir or args.generate
+    if (args.no_cache or args.semantic_cache) and not calls_model:
+        parser.error("--no-cache and --semantic-cache only apply when the model is called "
+                     "(--srs2json, --batch-dir or --generate).")
+
+    if args.batch_dir:
+        if args.srs2json or args.jsrs or args.ui or args.split:
+            parser.error("--batch-dir cannot be combined with --srs2json, --jsrs, --ui or --split.")
+        if args.batch or args.chunk_chars:
+            parser.error("--batch and --chunk-chars only apply to --srs2json, not --batch-dir.")
+        if args.generate:
+            parser.error("--batch-dir always generates; --generate only applies with --ui.")
+        if not os.path.isdir(args.batch_dir):
+            parser.error(f"--batch-dir: directory not found: {args.batch_dir}")
+        return
+
+    if args.srs2json and args.jsrs:
+        parser.error("--jsrs cannot be combined with --srs2json; with --ui, the converted SRS JSON is used.")
+    if args.batch and not args.srs2json:
+        parser.error("--batch requires --srs2json.")
+    if args.chunk_chars and not args.srs2json:
+        parser.error("--chunk-chars requires --srs2json.")
+    if args.batch and args.chunk_chars:
+        parser.error("--chunk-chars cannot be combined with --batch.")
+    if args.split and args.jsrs:
+        parser.error("--split cannot be combined with --jsrs.")
+    if args.jsrs and not args.ui:
+        parser.error("--jsrs requires --ui.")
+    if args.ui and not (args.jsrs or args.srs2json):
+        parser.error("--ui requires --jsrs or --srs2json.")
+    if args.generate and not args.ui:
+        parser.error("--generate requires --ui, with --jsrs or --srs2json.")
+    if not (args.srs2json or args.split or args.jsrs):
+        parser.error(
+            "You must provide either --srs2json, --split, --batch-dir, or both --jsrs and --ui.")
 
+    paths = (args.srs2json or []) + (args.jsrs or []) + (args.ui or [])
+    if args.split and not args.srs2json:
+        paths.append(args.split)
+    missing = [path for path in paths if not os.path.isfile(path)]
+    if missing:
+        parser.error(f"File(s) not found: {', '.join(missing)}")
+
+
+def build_arg_parser():
+    """Builds the command line parser; see `_validate_args` for the accepted combinations."""
     parser = argparse.ArgumentParser(
         description="Parse SRS to JSON & Generate a master prompt for creating automated test artifacts."
     )
     parser.add_argument(
         '--srs2json',
+        nargs='+',
         type=str,
-        help="If provided, convert a PDF SRS to JSON."
+        help="If provided, convert PDF SRS file(s) to JSON. With --ui, prompts are then generated from the converted JSON."
+    )
+    parser.add_argument(
+        "--batch",
+        action='store_true',
+        help="With --srs2json, convert all PDFs through the OpenAI Batch API (cheaper, but may take up to 24h)."
     )
     parser.add_argument(
         "--jsrs",
+        nargs='+',  # One prompt is generated per SRS section file
         type=str,
-        help="Path to the SRS JSON file containing feature requirements."
+        help="Path(s) to the SRS JSON file(s) containing feature requirements."
     )
     parser.add_argument(
         "--ui",
@@ -453,30 +1624,100 @@ def main():
     parser.add_argument(
         "--prefix", type=str, default="src/test/java/com/sdp/m1", help="Optional prefix for the prompt for examples\nDefault will be : `src/test/java/com/sdp/m1`."
     )
+    parser.add_argument(
+        "--generate",
+        action='store_true',
+        help="With --ui, send each prompt to the model and print the generated test artifacts instead of the prompt."
+    )
+    parser.add_argument(
+        "--batch-dir",
+        type=str,
+        help="Generate test artifacts concurrently for every <name>.srs.json / <name>.ui.json pair in this directory."
+    )
+    parser.add_argument(
+        "--no-cache",
+        action='store_true',
+        help=f"Always call the model instead of reusing responses cached in {PROMPT_CACHE_DIR}/."
+    )
+    parser.add_argument(
+        "--semantic-cache",
+        action='store_true',
+        help="Also reuse cached responses for near-duplicate prompts (same REQ_IDs, embedding cosine similarity >= 0.97)."
+    )
+    parser.add_argument(
+        "--chunk-chars",
+        type=int,
+        default=None,
+        help="With --srs2json, parse the SRS in section-aligned chunks of about this many characters, concurrently."
+    )
     parser.add_argument(
         "--split",
         type=str,
         default=False,
         help="Path to a JSON file to be splitd into individual section files."
     )
+    return parser
+
 
+def main():
+    """
+    Main function to generate a comprehensive prompt for AI-powered test generation.
+    """
+    parser = build_arg_parser()
     args = parser.parse_args()
+    _validate_args(parser, args)
+
+    global USE_PROMPT_CACHE, USE_SEMANTIC_CACHE, model
+    USE_PROMPT_CACHE = not args.no_cache
+    USE_SEMANTIC_CACHE = args.semantic_cache
+
+    # Only commands that call the model load the OpenAI client; printing a
+    # prompt or splitting a JSON file doesn't need it.
+    if args.srs2json or args.batch_dir or args.generate:
+        model = create_model_client(os.getenv("OPEN_API_KEY"))
+
+    # The UI context is merged first, so a bad UI file fails before any PDF
+    # is converted; it and the prompt prefix are shared by every prompt.
+    ui_content = None
+    if args.ui:
+        ui_content = prepare_ui_context(args.ui)
+        if ui_content is None:
+            return
 
     if args.srs2json:
-        srs_to_json(args.srs2json, args.split)
+        if args.batch:
+            srs_json_paths = srs_to_json_batch(args.srs2json, args.split)
+        else:
+            srs_json_paths = [srs_to_json(pdf_path, args.split, args.chunk_chars)
+                              for pdf_path in args.srs2json]
+        if not args.ui:
+            return
+        # The freshly converted SRS JSON goes straight into prompt generation
+        args.jsrs = [path for path in srs_json_paths if path]
     elif args.split:
         split_srs_json(args.split)
-    elif args.jsrs and args.ui:
-        prompt = generate_test_prompt(args.jsrs, args.ui, args.prefix)
-        if prompt:
-            print(prompt)
-    else:
-        parser.error(
-            "You must provide either --srs2json, --split, or both --jsrs and --ui.")
+        return
+    elif args.batch_dir:
+        generate_tests_batch(args.batch_dir, args.prefix)
+        return
+
+    for srs_json_path in args.jsrs:
+        # Cheap when unchanged; picks up example edits between sections
+        prompt_prefix = load_prompt_prefix(args.prefix)
+        if args.generate:
+            messages = generate_test_messages(
+                srs_json_path, ui_content, prompt_prefix)
+            if messages:
+                # The examples prefix is identical for every section, so it
+                # is sent as the (cached) system message.
+                prompt_prefix, prompt_context = messages
+                response = run_model(prompt_context, prompt_prefix)
+                if response:
+                    print(response)
+        elif emit_test_prompt(sys.stdout, srs_json_path, ui_content, prompt_prefix):
+            print()
 
 
 if __name__ == "__main__":
     load_dotenv()
-    api_key = os.getenv("OPEN_API_KEY")
-    model = OpenAI(api_key=api_key)
     main()
@@ -0,0 +1,489 @@
+"""
+Tests for the pure helpers in generator.py (no PDF or model access needed).
+
+    pip install -r requirements-dev.txt
+    python -m pytest test_generator.py
+"""
+import io
+import json
+import os
+import types
+
+import pytest
+
+import generator
+
+
+# chunk_srs_text
+
+PAGES = [
+    "Intro text\n2 Provisioning\n2.1 Profile\n" + "a" * 40,
+    "2.1.1 Register\n" + "b" * 50,
+    "2.1.2 Search\n" + "c" * 10,
+]
+
+
+def test_chunks_rejoin_to_the_page_text():
+    chunks = list(generator.chunk_srs_text(iter(PAGES), 60))
+    assert "".join(chunks) == "\n".join(PAGES)
+
+
+def test_chunks_start_at_section_headings():
+    chunks = list(generator.chunk_srs_text(iter(PAGES), 60))
+    assert len(chunks) > 1
+    for chunk in chunks[1:]:
+        assert generator.SECTION_HEADING_RE.match(chunk)
+
+
+def test_chunks_stay_within_budget_when_a_heading_allows_it():
+    chunks = list(generator.chunk_srs_text(iter(PAGES), 60))
+    for chunk in chunks:
+        headings = [m.start() for m in generator.SECTION_HEADING_RE.finditer(chunk) if m.start() > 0]
+        # Only a chunk without any heading to cut at may exceed the budget
+        assert len(chunk) <= 60 or not headings
+
+
+def test_text_without_headings_is_a_single_chunk():
+    pages = ["x" * 100, "y" * 100]
+    assert list(generator.chunk_srs_text(iter(pages), 50)) == ["\n".join(pages)]
+
+
+def test_small_document_is_a_single_chunk():
+    assert list(generator.chunk_srs_text(iter(["2.1 A\ntext"]), 1000)) == ["2.1 A\ntext"]
+
+
+# _merge_section_responses
+
+def test_merge_continues_a_section_split_across_chunks():
+    merged = json.loads(generator._merge_section_responses([
+        '{"Sections": [{"Section_ID": "1", "Sub_Sections": []},'
+        ' {"Section_ID": "2", "Sub_Sections": [{"Sub_Section_ID": "2.1"}]}]}',
+        '{"Sections": [{"Section_ID": "2", "Sub_Sections": [{"Sub_Section_ID": "2.2"}]},'
+        ' {"Section_ID": "3"}]}',
+    ]))
+    assert [s["Section_ID"] for s in merged["Sections"]] == ["1", "2", "3"]
+    assert [s["Sub_Section_ID"] for s in merged["Sections"][1]["Sub_Sections"]] == ["2.1", "2.2"]
+
+
+def test_merge_accepts_bare_arrays():
+    merged = json.loads(generator._merge_section_responses([
+        '[{"Section_ID": "2", "Sub_Sections": [{"a": 1}]}]',
+        '{"Sections": [{"Section_ID": "2"}]}',
+    ]))
+    assert merged == {"Sections": [{"Section_ID": "2", "Sub_Sections": [{"a": 1}]}]}
+
+
+def test_merge_rejects_a_document_without_sections():
+    with pytest.raises(ValueError):
+        generator._merge_section_responses(['{"SRS": [{"Section_ID": "1"}]}'])
+
+
+def test_merge_keeps_non_adjacent_sections_apart():
+    merged = json.loads(generator._merge_section_responses([
+        '{"Sections": [{"Section_ID": "1"}, {"Section_ID": "2"}]}',
+        '{"Sections": [{"Section_ID": "1"}]}',
+    ]))
+    assert [s["Section_ID"] for s in merged["Sections"]] == ["1", "2", "1"]
+
+
+# _CompiledTemplate
+
+@pytest.mark.parametrize("template", [
+    generator.MASTER_PROMPT_TEMPLATE,
+    generator.PARSER_INPUT_TEMPLATE,
+    "{a}{b}",
+    "literal only {{braces}}",
+    "{a} and {a} again",
+])
+def test_compiled_template_matches_str_format(template):
+    fields = {name: f"<{name} {{x}}>" for name in
+              ("feature_example", "page_object_example", "steps_example", "configs_example",
+               "utils_example", "hooks_example", "srs_json", "ui_json", "context", "a", "b")}
+    compiled = generator._CompiledTemplate(template)
+    assert compiled.render(**fields) == template.format(**fields)
+
+    out = io.StringIO()
+    compiled.emit(out, **fields)
+    assert out.getvalue() == template.format(**fields)
+
+
+def test_prefix_and_context_templates_add_up_to_the_master_prompt():
+    fields = {name: name.upper() for name in
+              ("feature_example", "page_object_example", "steps_example", "configs_example",
+               "utils_example", "hooks_example", "srs_json", "ui_json")}
+    assert (generator.PROMPT_PREFIX.render(**fields) + generator.PROMPT_CONTEXT.render(**fields)
+            == generator.MASTER_PROMPT_TEMPLATE.format(**fields))
+
+
+# _validate_args
+
+@pytest.fixture
+def inputs(tmp_path):
+    paths = {"dir": str(tmp_path)}
+    for key, name in (("pdf", "srs.pdf"), ("section", "section.json"), ("ui", "ui.json")):
+        path = tmp_path / name
+        path.write_text("{}")
+        paths[key] = str(path)
+    return paths
+
+
+def _validate(argv):
+    parser = generator.build_arg_parser()
+    args = parser.parse_args(argv)
+    generator._validate_args(parser, args)
+    return args
+
+
+@pytest.mark.parametrize("argv", [
+    ["--srs2json", "{pdf}"],
+    ["--srs2json", "{pdf}", "--batch"],
+    ["--srs2json", "{pdf}", "--chunk-chars", "1000"],
+    ["--srs2json", "{pdf}", "--ui", "{ui}", "--generate"],
+    ["--jsrs", "{section}", "--ui", "{ui}"],
+    ["--jsrs", "{section}", "--ui", "{ui}", "--generate"],
+    ["--split", "{section}"],
+    ["--batch-dir", "{dir}"],
+    ["--batch-dir", "{dir}", "--no-cache"],
+    ["--jsrs", "{section}", "--ui", "{ui}", "--generate", "--semantic-cache"],
+])
+def test_valid_combinations_are_accepted(inputs, argv):
+    _validate([arg.format(**inputs) for arg in argv])
+
+
+@pytest.mark.parametrize("argv", [
+    [],
+    ["--jsrs", "{section}"],
+    ["--ui", "{ui}"],
+    ["--batch"],
+    ["--chunk-chars", "1000", "--jsrs", "{section}", "--ui", "{ui}"],
+    ["--srs2json", "{pdf}", "--batch", "--chunk-chars", "1000"],
+    ["--srs2json", "{pdf}", "--jsrs", "{section}", "--ui", "{ui}"],
+    ["--srs2json", "{pdf}", "--generate"],
+    ["--split", "{section}", "--jsrs", "{section}", "--ui", "{ui}"],
+    ["--batch-dir", "{dir}", "--batch"],
+    ["--batch-dir", "{dir}", "--chunk-chars", "1000"],
+    ["--batch-dir", "{dir}", "--generate"],
+    ["--batch-dir", "{dir}", "--ui", "{ui}"],
+    ["--batch-dir", "{dir}/missing"],
+    ["--srs2json", "{dir}/missing.pdf"],
+    ["--jsrs", "{dir}/missing.json", "--ui", "{ui}"],
+    ["--srs2json", "{pdf}", "--no-cache", "--semantic-cache"],
+    ["--jsrs", "{section}", "--ui", "{ui}", "--no-cache"],
+    ["--jsrs", "{section}", "--ui", "{ui}", "--semantic-cache"],
+    ["--split", "{section}", "--no-cache"],
+])
+def test_invalid_combinations_are_rejected(inputs, argv):
+    with pytest.raises(SystemExit):
+        _validate([arg.format(**inputs) for arg in argv])
+
+
+# _iter_sections
+
+SECTIONS = [{"Section_ID": "1", "Section_Name": "Intro"}, {"Section_ID": "2", "Score": 1.5}]
+
+
+@pytest.fixture(params=["ijson", "full load"])
+def ijson_mode(request, monkeypatch):
+    if request.param == "ijson":
+        if generator.ijson is None:
+            pytest.skip("ijson is not installed")
+    else:
+        monkeypatch.setattr(generator, "ijson", None)
+
+
+@pytest.mark.parametrize("document", [
+    {"Sections": SECTIONS},
+    SECTIONS,
+], ids=["wrapped", "bare"])
+def test_iter_sections_reads_wrapped_and_bare_documents(ijson_mode, document):
+    source = io.BytesIO(b"\n  " + json.dumps(document, indent=2).encode("utf-8"))
+    assert list(generator._iter_sections(source)) == SECTIONS
+
+
+@pytest.mark.parametrize("document", [
+    {"sections": SECTIONS},
+    {"SRS": SECTIONS},
+    {},
+])
+def test_iter_sections_rejects_other_root_keys(ijson_mode, document):
+    source = io.BytesIO(json.dumps(document).encode("utf-8"))
+    with pytest.raises(ValueError):
+        list(generator._iter_sections(source))
+
+
+def test_iter_sections_accepts_an_empty_section_list(ijson_mode):
+    source = io.BytesIO(b'{"Sections": []}')
+    assert list(generator._iter_sections(source)) == []
+
+
+def test_split_srs_json_reports_a_missing_sections_key(tmp_path, capsys):
+    json_path = tmp_path / "srs.json"
+    json_path.write_text(json.dumps({"sections": SECTIONS}))
+    assert generator.split_srs_json(str(json_path)) is None
+    assert not (tmp_path / "srs_sections").exists()
+    assert "Error" in capsys.readouterr().out
+
+
+def test_save_srs_json_keeps_the_previous_output_for_a_bad_response(tmp_path):
+    output_path = tmp_path / "srs.json"
+    output_path.write_text('{"Sections": [{"Section_ID": "1"}]}')
+    assert generator._save_srs_json(str(tmp_path / "srs.pdf"), '{"SRS": []}') is None
+    assert output_path.read_text() == '{"Sections": [{"Section_ID": "1"}]}'
+
+
+def test_split_srs_json_writes_one_file_per_section(tmp_path):
+    json_path = tmp_path / "srs.json"
+    json_path.write_text(json.dumps({"Sections": SECTIONS}))
+    output_dir = generator.split_srs_json(str(json_path))
+    assert sorted(p.name for p in (tmp_path / "srs_sections").iterdir()) == [
+        "1-Intro.json", "2-Unnamed.json"]
+    assert output_dir == str(tmp_path / "srs_sections")
+
+
+# _prune_empty
+
+def test_prune_empty_drops_nulls_and_empty_containers():
+    assert generator._prune_empty({
+        "REQ_ID": "REQ-1",
+        "Fields": [],
+        "UI_Elements": [{"Label": "Name", "Identifier": None}],
+        "Constraints": {"Mandatory": False, "MaxLength": 0, "Notes": {}},
+        "Nested": {"Empty": {"Inner": []}},
+        "Text": "",
+    }) == {
+        "REQ_ID": "REQ-1",
+        "UI_Elements": [{"Label": "Name"}],
+        # False, 0 and "" are real values and are kept
+        "Constraints": {"Mandatory": False, "MaxLength": 0},
+        "Text": "",
+    }
+
+
+def test_prune_empty_keeps_list_items():
+    assert generator._prune_empty([None, [], {"a": None}, 1]) == [None, [], {}, 1]
+
+
+# _dedup / _merge_component
+
+def test_dedup_keeps_the_first_of_equal_dicts_in_order():
+    assert generator._dedup(
+        [{"t": "click", "x": 1}, {"t": "type"}],
+        [{"x": 1, "t": "click"}, {"t": "hover"}],
+    ) == [{"t": "click", "x": 1}, {"t": "type"}, {"t": "hover"}]
+
+
+def test_merge_component_copies_a_new_component():
+    component = {"selector": "#a", "actions": [{"t": "click"}]}
+    component_map = {}
+    generator._merge_component(component_map, component)
+    component_map["#a"]["actions"].append({"t": "type"})
+    assert component["actions"] == [{"t": "click"}]
+    assert component_map["#a"]["fields"] == [] and component_map["#a"]["error_messages"] == []
+
+
+def test_merge_component_skips_components_without_a_selector():
+    component_map = {}
+    generator._merge_component(component_map, {"actions": [{"t": "click"}]})
+    assert component_map == {}
+
+
+@pytest.mark.parametrize("classes", [["field", "error"], "field error"], ids=["list", "string"])
+def test_merge_component_records_error_text(classes):
+    component_map = {}
+    generator._merge_component(component_map, {"selector": "#e", "actions": [{"t": "click"}]})
+    generator._merge_component(component_map, {
+        "selector": "#e", "classes": classes, "text": " Required ", "actions": [{"t": "click"}]})
+    generator._merge_component(component_map, {
+        "selector": "#e", "classes": classes, "text": "Required"})
+    merged = component_map["#e"]
+    assert merged["actions"] == [{"t": "click"}]
+    assert merged["error_messages"] == ["Required"]
+    assert merged["conditional"] is True
+
+
+def test_merge_component_ignores_text_without_an_error_class():
+    component_map = {}
+    generator._merge_component(component_map, {"selector": "#e"})
+    generator._merge_component(component_map, {"selector": "#e", "classes": ["hint"], "text": "Note"})
+    assert component_map["#e"]["error_messages"] == []
+    assert "conditional" not in component_map["#e"]
+
+
+UI_PAGES = [
+    {"pageUrl": "https://example.test/a", "components": [
+        {"selector": "#name", "actions": [{"type": "input"}], "fields": [{"max": 1.5}]},
+        {"selector": "#err", "classes": ["error"], "text": "Required"},
+        {"actions": [{"type": "click"}]},
+    ]},
+    {"components": [
+        {"selector": "#name", "actions": [{"type": "input"}, {"type": "clear"}]},
+        {"selector": "#err", "classes": ["error"], "text": " Too long "},
+    ]},
+]
+
+
+def test_merge_ui_files_matches_with_and_without_ijson(tmp_path, monkeypatch):
+    if generator.ijson is None:
+        pytest.skip("ijson is not installed")
+    paths = []
+    for i, page in enumerate(UI_PAGES):
+        path = tmp_path / f"ui{i}.json"
+        path.write_text(json.dumps(page, indent=2))
+        paths.append(str(path))
+
+    streamed = generator.merge_ui_files(paths)
+    monkeypatch.setattr(generator, "ijson", None)
+    loaded = generator.merge_ui_files(paths)
+    assert streamed == loaded == generator.merge_ui_jsons(UI_PAGES)
+    assert streamed["pageUrl"] == "https://example.test/a"
+    assert [c["selector"] for c in streamed["components"]] == ["#name", "#err"]
+
+
+# Response cache
+
+def _request(prompt, **options):
+    return {"model": "m", "messages": [{"role": "user", "content": prompt}], **options}
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    monkeypatch.setattr(generator, "PROMPT_CACHE_DIR", str(cache_dir))
+    monkeypatch.setattr(generator, "SEMANTIC_INDEX_PATH", str(cache_dir / "semantic_index.jsonl"))
+    monkeypatch.setattr(generator, "_SEMANTIC_INDEX", None)
+    monkeypatch.setattr(generator, "USE_PROMPT_CACHE", True)
+    return cache_dir
+
+
+def test_cache_round_trips_the_response_exactly(cache_dir):
+    request = _request("prompt")
+    assert generator._cache_get(request) is None
+    content = "line 1\r\nline 2\rline 3\n\u00e9"
+    generator._cache_put(request, content)
+    assert generator._cache_get(request) == content
+    assert [p.name for p in cache_dir.iterdir()] == [
+        os.path.basename(generator._cache_path(request))]
+
+
+def test_cache_path_depends_on_the_whole_request_but_not_key_order(cache_dir):
+    request = _request("prompt", temperature=0)
+    assert generator._cache_path(request) == generator._cache_path(dict(reversed(request.items())))
+    assert generator._cache_path(request) != generator._cache_path(_request("prompt", temperature=1))
+    assert generator._cache_path(request) != generator._cache_path(_request("prompt 2", temperature=0))
+
+
+def test_cache_is_bypassed_when_disabled(cache_dir, monkeypatch):
+    monkeypatch.setattr(generator, "USE_PROMPT_CACHE", False)
+    generator._cache_put(_request("prompt"), "response")
+    assert generator._cache_get(_request("prompt")) is None
+    assert not cache_dir.exists()
+
+
+# Semantic cache
+
+def test_semantic_fingerprint_ignores_the_embedded_head_but_not_req_ids_or_tail(monkeypatch):
+    monkeypatch.setattr(generator, "EMBEDDING_MAX_CHARS", 40)
+    fingerprint = generator._semantic_fingerprint
+    base = fingerprint(_request("REQ-1 login with a valid user." + " " * 20 + "TAIL"))
+    assert fingerprint(_request("REQ-1 login with a valid user!" + " " * 20 + "TAIL")) == base
+    assert fingerprint(_request("REQ-2 login with a valid user." + " " * 20 + "TAIL")) != base
+    assert fingerprint(_request("REQ-1 login with a valid user." + " " * 20 + "TAIL!")) != base
+    assert fingerprint(_request("REQ-1 login with a valid user." + " " * 20 + "TAIL",
+                                temperature=1)) != base
+
+
+def test_semantic_lookup_only_hits_above_the_threshold(cache_dir, monkeypatch):
+    monkeypatch.setattr(generator, "SEMANTIC_CACHE_THRESHOLD", 0.95)
+    request = _request("REQ-1 prompt")
+    generator._cache_put(request, "response")
+    generator._semantic_add(request, [1.0, 0.0])
+    # The index is reloaded from disk, not just kept in memory
+    monkeypatch.setattr(generator, "_SEMANTIC_INDEX", None)
+
+    near = _request("REQ-1 prompt, reworded")
+    assert generator._semantic_lookup(near, generator._normalize([1.0, 0.1])) == "response"
+    assert generator._semantic_lookup(near, generator._normalize([1.0, 0.5])) is None
+    assert generator._semantic_lookup(near, None) is None
+    other = _request("REQ-2 prompt, reworded")
+    assert generator._semantic_lookup(other, [1.0, 0.0]) is None
+
+
+# _load_compiled_prefix
+
+@pytest.fixture
+def compiled_prefix(monkeypatch):
+    compiled = types.SimpleNamespace(
+        EXAMPLES_PREFIX="src/test/java/com/sdp/m1",
+        TEMPLATE_SHA1=generator.prompt_template_hash(),
+        EXAMPLE_MTIMES={"a.java": 1, "b.java": None},
+        PREFIX="compiled prefix",
+    )
+    monkeypatch.setattr(generator, "_compiled_prefix", compiled)
+    return compiled
+
+
+def test_compiled_prefix_is_used_when_up_to_date(compiled_prefix):
+    assert generator._load_compiled_prefix(
+        "src/test/java/com/sdp/m1", {"a.java": 1, "b.java": None}) == "compiled prefix"
+
+
+@pytest.mark.parametrize("prefix, mtimes, template_sha1", [
+    ("other/prefix", {"a.java": 1, "b.java": None}, None),
+    ("src/test/java/com/sdp/m1", {"a.java": 2, "b.java": None}, None),
+    ("src/test/java/com/sdp/m1", {"a.java": 1, "b.java": 1}, None),
+    ("src/test/java/com/sdp/m1", {"a.java": 1}, None),
+    ("src/test/java/com/sdp/m1", {"a.java": 1, "b.java": None}, "0" * 40),
+], ids=["prefix", "edited", "created", "removed", "template"])
+def test_compiled_prefix_is_ignored_when_stale(compiled_prefix, prefix, mtimes, template_sha1):
+    if template_sha1:
+        compiled_prefix.TEMPLATE_SHA1 = template_sha1
+    assert generator._load_compiled_prefix(prefix, mtimes) is None
+
+
+def test_compiled_prefix_is_ignored_when_not_built(monkeypatch):
+    monkeypatch.setattr(generator, "_compiled_prefix", None)
+    assert generator._load_compiled_prefix("src/test/java/com/sdp/m1", {}) is None
+
+
+# srs_to_json_batch
+
+def _batch_line(custom_id, status_code, body):
+    return json.dumps({"custom_id": custom_id, "response": {"status_code": status_code, "body": body}})
+
+
+def test_srs_to_json_batch_accounts_for_every_pdf(tmp_path, monkeypatch, capsys):
+    ok, failed, truncated, missing = (str(tmp_path / f"{name}.pdf")
+                                      for name in ("ok", "failed", "truncated", "missing"))
+    files = {
+        "output": "\n".join([
+            _batch_line(ok, 200, {"choices": [{"finish_reason": "stop", "message": {
+                "content": '{"Sections": [{"Section_ID": "1"}]}'}}]}),
+            _batch_line(truncated, 200, {"choices": [{"finish_reason": "length", "message": {
+                "content": '{"Sections": ['}}]}),
+        ]).encode("utf-8") + b"\n",
+        "errors": _batch_line(failed, 400, {"error": {"message": "bad request"}}).encode("utf-8"),
+    }
+    uploads = []
+    batch = types.SimpleNamespace(
+        id="batch_1", status="completed", output_file_id="output", error_file_id="errors")
+    monkeypatch.setattr(generator, "model", types.SimpleNamespace(
+        files=types.SimpleNamespace(
+            create=lambda file, purpose: uploads.append(file[1]) or types.SimpleNamespace(id="input"),
+            content=lambda file_id: types.SimpleNamespace(content=files[file_id]),
+        ),
+        batches=types.SimpleNamespace(create=lambda **kwargs: batch, retrieve=lambda batch_id: batch),
+    ))
+    monkeypatch.setattr(generator, "_srs_parser_input", lambda pdf_path: f"text of {pdf_path}")
+
+    output_paths = generator.srs_to_json_batch([ok, failed, ok, truncated, missing])
+
+    # The duplicate PDF is submitted once
+    assert [json.loads(line)["custom_id"] for line in uploads[0].splitlines()] == [
+        ok, failed, truncated, missing]
+    assert output_paths == [str(tmp_path / "ok.json")]
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["ok.json"]
+    out = capsys.readouterr().out
+    assert f"Batch request for {failed} failed (status 400)" in out
+    assert f"Batch output for {truncated} is incomplete" in out
+    assert f"returned no result for {missing}" in out
+    assert f"returned no result for {ok}" not in out